@@ -1,15 +1,54 @@
 # app_logic.py
 import os
+import gzip
 import json
 import copy
 import math
+import itertools
 from collections import defaultdict
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+try:
+    import orjson # Optional: parses large scene files several times faster than json
+except ImportError:
+    orjson = None
 
 from data_models import AnimationFile, AnimationClip, FloatParameter, ControllerTarget, TriggerGroup
 from keyframe_logic import KeyframeEncoder, KeyframeDecoder
 
+# Rest pose used when a controller has to be added to a clip that did not animate it.
+_FILL_AXIS_VALUES = (('X', 0.0), ('Y', 0.0), ('Z', 0.0), ('RotX', 0.0), ('RotY', 0.0), ('RotZ', 0.0), ('RotW', 1.0))
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+def _read_json(file_name):
+    """Parses a JSON file, gzip-compressed or not (detected by its magic bytes, not the extension)."""
+    with open(file_name, 'rb') as f: raw = f.read()
+    if raw[:2] == _GZIP_MAGIC: raw = gzip.decompress(raw)
+    # Saving stays on json: orjson cannot write the indent=3 layout the files use.
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _open_for_save(file_name):
+    # Only .gz paths are compressed: VaM itself reads plain JSON. Level 1 is much faster than the default and
+    # compresses keyframe text nearly as well.
+    if file_name.lower().endswith('.gz'):
+        return gzip.open(file_name, 'wt', encoding='utf-8', compresslevel=1)
+    return open(file_name, 'w', encoding='utf-8')
+
+class _FileLoadSignals(QObject):
+    finished = pyqtSignal(str, object, object) # file_name, AnimationFile or None, exception or None
+
+class _FileLoadTask(QRunnable):
+    """Runs AppLogic._read_animation_file off the UI thread and reports the result through a queued signal."""
+    def __init__(self, app_logic, file_name):
+        super().__init__()
+        self.app_logic, self.file_name = app_logic, file_name
+        self.signals = _FileLoadSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.file_name, *self.app_logic._read_animation_file(self.file_name))
+
 class MergeError(Exception):
     """Custom exception for merge failures."""
     pass
@@ -17,6 +56,11 @@ class MergeError(Exception):
 class AppLogic(QObject):
     file_changed = pyqtSignal(str)
     clips_updated = pyqtSignal()
+    layer_reordered = pyqtSignal(object)
+    clips_added = pyqtSignal(list)
+    clips_removed = pyqtSignal(list)
+    clips_renamed = pyqtSignal(list)
+    branch_renamed = pyqtSignal(object, str) # old segment/layer data tuple, new name
     log_requested = pyqtSignal(str)
     error_occurred = pyqtSignal(str, str)
 
@@ -25,18 +69,39 @@ class AppLogic(QObject):
         self.animation_file = None
         self.current_file_path = None
         self.last_center_root_delta_xz = (0.0, 0.0)
+        # Lookup caches over animation_file.clips, see _get_layer_index.
+        self._indexed_clips = None
+        self._layer_index = {}
+        self._layer_signatures = {}
+        self._segment_keys = set()
+        self._max_order_index = -1
+        self._load_task = None
 
     def load_file(self, file_name):
+        self._finish_load(file_name, *self._read_animation_file(file_name))
+
+    def load_file_async(self, file_name):
+        """Like load_file, but parses on the global thread pool; the result is applied on this object's thread."""
+        task = _FileLoadTask(self, file_name)
+        task.signals.finished.connect(self._finish_load)
+        self._load_task = task # Keeps the task and its signal carrier alive until it reports back
+        QThreadPool.globalInstance().start(task)
+
+    def _read_animation_file(self, file_name):
+        """
+        Parses a file into a new AnimationFile and returns (animation_file, error).
+        Touches no AppLogic state apart from emitting log messages, so it can run on a worker thread.
+        """
         try:
-            with open(file_name, 'r', encoding='utf-8') as f: data = json.load(f)
+            data = _read_json(file_name)
 
-            self.animation_file = AnimationFile()
+            animation_file = AnimationFile()
             is_scene = "atoms" in data
-            self.animation_file.is_scene = is_scene
+            animation_file.is_scene = is_scene
 
             if is_scene:
                 self.log_requested.emit("Loading scene file...")
-                self.animation_file.original_json = data
+                animation_file.original_json = data
                 all_clips = []
                 for atom_data in data.get("atoms", []):
                     atom_id = atom_data.get("id")
@@ -49,57 +114,106 @@ class AppLogic(QObject):
                                 for i, clip_data in enumerate(anim_data.get("Clips", [])):
                                     clip = AnimationClip.from_dict(clip_data, atom_id=atom_id, storable_id=storable_id, order_index=i)
                                     all_clips.append(clip)
-                self.animation_file.clips = all_clips
+                                # save_file rebuilds Clips from the models, so the raw dicts are not kept around
+                                # (nor deep-copied on every save).
+                                anim_data["Clips"] = []
+                animation_file.clips = all_clips
             else:
                 self.log_requested.emit("Loading animation export file...")
-                self.animation_file.version = data.get("SerializeVersion")
-                self.animation_file.atom_type = data.get("AtomType")
-                self.animation_file.clips = [
+                animation_file.version = data.get("SerializeVersion")
+                animation_file.atom_type = data.get("AtomType")
+                animation_file.clips = [
                     AnimationClip.from_dict(d, atom_id="(Standalone)", order_index=i)
                     for i, d in enumerate(data.get("Clips", []))
                 ]
-            
-            self.current_file_path = file_name
-            self.log_requested.emit(f"Loaded: {file_name}")
-            self.file_changed.emit(file_name)
+            return animation_file, None
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            self.animation_file = None
+            return None, e
+
+    def _finish_load(self, file_name, animation_file, error):
+        self._load_task = None
+        self.animation_file = animation_file
+        if error is None:
+            self.current_file_path = file_name
+            self.log_requested.emit(f"Loaded: {file_name}")
+            self.file_changed.emit(file_name)
+        else:
             self.current_file_path = None
-            self.error_occurred.emit("Error Loading File", f"Failed to load '{file_name}':\n{e}")
+            self.error_occurred.emit("Error Loading File", f"Failed to load '{file_name}':\n{error}")
             self.file_changed.emit(None)
 
-    def mark_as_dirty(self):
+    def mark_as_dirty(self, refresh_tree=True):
         if self.current_file_path and not self.current_file_path.endswith(" *"):
             self.current_file_path += " *"
         elif not self.current_file_path:
              self.current_file_path = "Unsaved File *"
 
+        self._invalidate_indexes()
         self.file_changed.emit(os.path.basename(self.current_file_path))
-        self.clips_updated.emit()
+        if refresh_tree:
+            self.clips_updated.emit()
     
+    def _get_layer_index(self):
+        """
+        Returns a dict mapping (atom_id, segment, layer) to that layer's clips in file order.
+        Built on first use and dropped by _invalidate_indexes (called from mark_as_dirty), or
+        when animation_file.clips is replaced. Code that moves clips between layers and then
+        looks layers up again before mark_as_dirty must invalidate explicitly.
+        """
+        clips = self.animation_file.clips
+        if self._indexed_clips is not clips:
+            index, max_order = defaultdict(list), -1
+            for clip in clips:
+                index[(clip.atom_id, clip.segment, clip.layer)].append(clip)
+                if clip.order_index > max_order: max_order = clip.order_index
+            self._max_order_index = max_order
+            self._layer_index = index
+            self._layer_signatures = {}
+            self._segment_keys = {key[:2] for key in index}
+            self._indexed_clips = clips
+        return self._layer_index
+
+    def _invalidate_indexes(self):
+        self._indexed_clips = None
+
     def get_layer_clips(self, atom_id, segment_name, layer_name):
         if not self.animation_file: return []
-        is_scene = self.animation_file.is_scene
-        return [c for c in self.animation_file.clips if (not is_scene or c.atom_id == atom_id) and c.segment == segment_name and c.layer == layer_name]
+        # Export files only hold "(Standalone)" clips, so the atom part of the key always matches there.
+        return list(self._get_layer_index().get((atom_id, segment_name, layer_name), ()))
+
+    def _get_segment_keys(self):
+        """Returns the set of (atom_id, segment) pairs in the file, kept alongside the layer index."""
+        self._get_layer_index()
+        return self._segment_keys
+
+    def _get_max_order_index(self):
+        """Returns the highest order_index in the file (-1 when empty), found while building the layer index."""
+        self._get_layer_index()
+        return self._max_order_index
+
+    def _get_layers_in_segment(self, atom_id, seg_name):
+        return {layer for (a_id, seg, layer) in self._get_layer_index() if a_id == atom_id and seg == seg_name}
 
     def _get_layer_signature(self, atom_id, seg_name, layer_name, clips_source=None):
         """Calculates a 'signature' of a layer based on its controlled targets."""
-        source = clips_source if clips_source is not None else self.animation_file.clips
-        
-        clips_in_layer = [
-            c for c in source 
-            if c.atom_id == atom_id and c.segment == seg_name and c.layer == layer_name
-        ]
-
-        if not clips_in_layer:
-            return (frozenset(), frozenset(), frozenset())
-            
-        fp_keys = {(p.storable, p.name) for c in clips_in_layer for p in c.float_params}
-        c_ids = {c.id for c in clips_in_layer for c in c.controllers}
-        tg_names = {tg.name for c in clips_in_layer for tg in c.trigger_groups}
+        if clips_source is None:
+            key = (atom_id, seg_name, layer_name)
+            index = self._get_layer_index()
+            signature = self._layer_signatures.get(key)
+            if signature is None:
+                signature = self._layer_signatures[key] = self._get_layer_signature(atom_id, seg_name, layer_name, index.get(key, ()))
+            return signature
+
+        # Single pass: each clip's targets are visited once for all three sets.
+        fp_keys, c_ids, tg_names = set(), set(), set()
+        for clip in clips_source:
+            if clip.atom_id != atom_id or clip.segment != seg_name or clip.layer != layer_name: continue
+            fp_keys.update(clip.float_param_keys())
+            c_ids.update(clip.controller_ids())
+            for tg in clip.trigger_groups: tg_names.add(tg.name)
         return (frozenset(fp_keys), frozenset(c_ids), frozenset(tg_names))
 
     def merge_layers(self, src_layer_data, tgt_layer_data):
@@ -115,24 +229,29 @@ class AppLogic(QObject):
         src_clips = self.get_layer_clips(src_atom_id, src_seg_name, src_layer_name)
         tgt_clips = self.get_layer_clips(tgt_atom_id, tgt_seg_name, tgt_layer_name)
 
-        all_clips = src_clips + tgt_clips
-        master_fp = {(p.storable, p.name): p for clip in all_clips for p in clip.float_params}
-        master_c = {c.id: c for clip in all_clips for c in clip.controllers}
-        master_tg = {tg.name: tg for clip in all_clips for tg in clip.trigger_groups}
+        # Target clips come first so their targets serve as templates for the fill-in below.
+        master_fp, master_c, master_tg = {}, {}, {}
+        for clip in itertools.chain(tgt_clips, src_clips):
+            for p in clip.float_params: master_fp.setdefault((p.storable, p.name), p)
+            for c in clip.controllers: master_c.setdefault(c.id, c)
+            for tg in clip.trigger_groups: master_tg.setdefault(tg.name, tg)
 
+        tgt_by_name = {}
+        for c in tgt_clips: tgt_by_name.setdefault(c.name, c)
+        merged_ids = set() # Source clips folded into a target clip; dropped from the file in one pass below
         for src_clip in src_clips:
-            matching_tgt_clip = next((c for c in tgt_clips if c.name == src_clip.name), None)
+            matching_tgt_clip = tgt_by_name.get(src_clip.name)
             
             if matching_tgt_clip:
-                existing_fp_keys = {(p.storable, p.name) for p in matching_tgt_clip.float_params}
+                existing_fp_keys = matching_tgt_clip.float_param_keys()
                 for param in src_clip.float_params:
                     if (param.storable, param.name) not in existing_fp_keys:
-                        matching_tgt_clip.float_params.append(param)
+                        matching_tgt_clip.add_float_param(param)
                 
-                existing_c_ids = {c.id for c in matching_tgt_clip.controllers}
+                existing_c_ids = matching_tgt_clip.controller_ids()
                 for controller in src_clip.controllers:
                     if controller.id not in existing_c_ids:
-                        matching_tgt_clip.controllers.append(controller)
+                        matching_tgt_clip.add_controller(controller)
 
                 for src_tg in src_clip.trigger_groups:
                     current_tgt_tg_names = {tg.name for tg in matching_tgt_clip.trigger_groups}
@@ -148,26 +267,43 @@ class AppLogic(QObject):
                         new_tg.name = new_name
                         matching_tgt_clip.trigger_groups.append(new_tg)
                 
-                self.animation_file.clips.remove(src_clip)
+                merged_ids.add(id(src_clip))
             else:
                 src_clip.layer = tgt_layer_name
 
+        if merged_ids:
+            self.animation_file.clips = [c for c in self.animation_file.clips if id(c) not in merged_ids]
+        self._invalidate_indexes()
         final_tgt_clips = self.get_layer_clips(tgt_atom_id, tgt_seg_name, tgt_layer_name)
+        # Fill-in curves per clip length: (float param curve, {axis: curve} for controllers).
+        fill_templates = {}
         for clip in final_tgt_clips:
-            clip_fp_keys = {(p.storable, p.name) for p in clip.float_params}
-            for key, t_param in master_fp.items():
-                if key not in clip_fp_keys:
-                    new_param = FloatParameter(t_param.storable, t_param.name, [KeyframeEncoder.encode_keyframe(0.0, 0.0, 3, 0.0, -1), KeyframeEncoder.encode_keyframe(clip.length, 0.0, 3, 0.0, 3)], t_param.min, t_param.max)
-                    clip.float_params.append(new_param)
-
-            clip_c_ids = {c.id for c in clip.controllers}
-            for c_id, t_ctrl in master_c.items():
-                if c_id not in clip_c_ids:
-                    new_c = ControllerTarget(c_id, **copy.deepcopy(t_ctrl.properties))
-                    for axis in ['X', 'Y', 'Z', 'RotX', 'RotY', 'RotZ']:
-                        new_c.properties[axis] = [KeyframeEncoder.encode_keyframe(0.0, 0.0, 3, 0.0, -1), KeyframeEncoder.encode_keyframe(clip.length, 0.0, 3, 0.0, 3)]
-                    new_c.properties['RotW'] = [KeyframeEncoder.encode_keyframe(0.0, 1.0, 3, 0.0, -1), KeyframeEncoder.encode_keyframe(clip.length, 1.0, 3, 1.0, 3)]
-                    clip.controllers.append(new_c)
+            template = fill_templates.get(clip.length)
+            if template is None:
+                template = fill_templates[clip.length] = (
+                    KeyframeEncoder.encode_flat_curve(clip.length, 0.0),
+                    {axis: KeyframeEncoder.encode_flat_curve(clip.length, value) for axis, value in _FILL_AXIS_VALUES}
+                )
+            param_curve, axis_curves = template
+
+            # Missing targets come from one set difference each; the setters re-sort the extended lists in one go.
+            missing_fp_keys = master_fp.keys() - clip.float_param_keys()
+            if missing_fp_keys:
+                clip.float_params = clip.float_params + [
+                    FloatParameter(t_param.storable, t_param.name, list(param_curve), t_param.min, t_param.max)
+                    for t_param in map(master_fp.__getitem__, missing_fp_keys)
+                ]
+
+            missing_c_ids = master_c.keys() - clip.controller_ids()
+            if missing_c_ids:
+                # Axis curves are replaced anyway, so only the template's other properties are copied (in its key order).
+                clip.controllers = clip.controllers + [
+                    ControllerTarget(c_id, **{
+                        k: list(axis_curves[k]) if k in axis_curves else (v if isinstance(v, str) else copy.deepcopy(v))
+                        for k, v in master_c[c_id].properties.items()
+                    })
+                    for c_id in missing_c_ids
+                ]
 
             clip_tg_names = {tg.name for tg in clip.trigger_groups}
             for tg_name, t_group in master_tg.items():
@@ -188,8 +324,7 @@ class AppLogic(QObject):
             raise MergeError("Cannot merge into a scene file or an empty project.")
 
         try:
-            with open(source_file_path, 'r', encoding='utf-8') as f:
-                source_data = json.load(f)
+            source_data = _read_json(source_file_path)
         except Exception as e:
             raise MergeError(f"Failed to read source file: {e}")
 
@@ -211,16 +346,16 @@ class AppLogic(QObject):
         for clip in source_anim.clips:
             source_grouped[clip.segment][clip.layer].append(clip)
         
-        max_order = max((c.order_index for c in self.animation_file.clips), default=-1)
+        max_order = self._get_max_order_index()
         added_count = 0
 
         for seg_name, layers in source_grouped.items():
             for layer_name, clips in layers.items():
-                src_signature = self._get_layer_signature("(Standalone)", seg_name, layer_name, source_anim.clips)
+                src_signature = self._get_layer_signature("(Standalone)", seg_name, layer_name, clips) # Already grouped, no rescan of the source file
                 
                 # Find compatible layer in target file
                 target_layer_name = layer_name
-                layers_in_target_segment = {c.layer for c in self.animation_file.clips if c.segment == seg_name}
+                layers_in_target_segment = self._get_layers_in_segment("(Standalone)", seg_name)
                 compatible_layer_found = False
                 for existing_layer in layers_in_target_segment:
                     if src_signature == self._get_layer_signature("(Standalone)", seg_name, existing_layer):
@@ -237,30 +372,34 @@ class AppLogic(QObject):
                     self.log_requested.emit(f"Created new compatible layer '{target_layer_name}' in segment '{seg_name}'.")
 
                 # Add clips to the determined target layer
-                existing_names_in_tgt_layer = {c.name for c in self.animation_file.clips if c.segment == seg_name and c.layer == target_layer_name}
+                tgt_by_name = {}
+                for c in self.get_layer_clips("(Standalone)", seg_name, target_layer_name): tgt_by_name.setdefault(c.name, c)
+                replaced_ids = set()
                 for clip in clips:
-                    is_conflict = clip.name in existing_names_in_tgt_layer
+                    is_conflict = clip.name in tgt_by_name
                     if is_conflict and conflict_strategy == "skip":
                         self.log_requested.emit(f"Skipping '{clip.name}' due to name conflict."); continue
                     
-                    new_clip = copy.deepcopy(clip)
+                    new_clip = clip.clone()
                     new_clip.segment, new_clip.layer = seg_name, target_layer_name
                     
                     if is_conflict and conflict_strategy == "replace":
-                        to_remove = next(c for c in self.animation_file.clips if c.segment == seg_name and c.layer == target_layer_name and c.name == clip.name)
-                        self.animation_file.clips.remove(to_remove)
+                        replaced_ids.add(id(tgt_by_name[clip.name]))
                         self.log_requested.emit(f"Replacing clip '{clip.name}' in '{seg_name}/{target_layer_name}'.")
                     elif is_conflict and conflict_strategy == "rename":
                         base, i = clip.name, 1; new_name = f"{base}_merged"
-                        while new_name in existing_names_in_tgt_layer: new_name = f"{base}_merged_{i}"; i += 1
+                        while new_name in tgt_by_name: new_name = f"{base}_merged_{i}"; i += 1
                         new_clip.name = new_name
                         self.log_requested.emit(f"Renaming '{clip.name}' to '{new_clip.name}'.")
                     
                     max_order += 1
                     new_clip.order_index = max_order
                     self.animation_file.clips.append(new_clip)
-                    existing_names_in_tgt_layer.add(new_clip.name)
+                    tgt_by_name[new_clip.name] = new_clip
                     added_count += 1
+                if replaced_ids:
+                    self.animation_file.clips = [c for c in self.animation_file.clips if id(c) not in replaced_ids]
+                self._invalidate_indexes()
         
         self.log_requested.emit(f"Merge complete. Added {added_count} clip(s).")
         self.mark_as_dirty()
@@ -279,14 +418,15 @@ class AppLogic(QObject):
         if target_clip and drop_pos == 'Below':
             target_idx += 1
             
-        for clip in reversed(dragged_clips):
-            remaining_clips.insert(target_idx, clip)
+        remaining_clips[target_idx:target_idx] = dragged_clips
             
         for i, clip in enumerate(remaining_clips):
             clip.order_index = i
             
         self.log_requested.emit(f"Reordered {len(dragged_clips)} clip(s) in layer '{layer_name}'.")
-        self.mark_as_dirty()
+        # Only order_index values changed, so the view can re-sort this layer instead of rebuilding.
+        self.mark_as_dirty(refresh_tree=False)
+        self.layer_reordered.emit(layer_data)
         
     def move_or_copy_clips_to_layer(self, source_clips_ids, target_layer_data, is_copy):
         source_clips = [c for c in self.animation_file.clips if id(c) in source_clips_ids]
@@ -306,7 +446,7 @@ class AppLogic(QObject):
             
             # Find a compatible layer in the target segment
             compatible_layer = None
-            layers_in_tgt_segment = {c.layer for c in self.animation_file.clips if c.atom_id == tgt_atom and c.segment == tgt_seg}
+            layers_in_tgt_segment = self._get_layers_in_segment(tgt_atom, tgt_seg)
             
             for existing_layer in layers_in_tgt_segment:
                 tgt_signature = self._get_layer_signature(tgt_atom, tgt_seg, existing_layer)
@@ -334,7 +474,7 @@ class AppLogic(QObject):
         for src_clip in source_clips:
             max_order += 1
             if is_copy:
-                new_clip = copy.deepcopy(src_clip)
+                new_clip = src_clip.clone()
                 new_clip.atom_id, new_clip.segment, new_clip.layer, new_clip.order_index = tgt_atom, tgt_seg, final_tgt_layer_name, max_order
                 self.animation_file.clips.append(new_clip)
                 self.log_requested.emit(f"Copied '{src_clip.name}' to '{tgt_atom}/{tgt_seg}/{final_tgt_layer_name}'.")
@@ -355,17 +495,19 @@ class AppLogic(QObject):
         
         if not any([segs, layers, clips_to_delete]): return
 
-        initial_count = len(self.animation_file.clips)
-        self.animation_file.clips = [
-            c for c in self.animation_file.clips if not (
-                c in clips_to_delete or
-                (c.atom_id, c.segment) in segs or
-                (c.atom_id, c.segment, c.layer) in layers
+        kept_clips, deleted_clips = [], []
+        for c in self.animation_file.clips:
+            is_deleted = (
+                c in clips_to_delete or # AnimationClip hashes by identity, so this is a pointer lookup
+                (segs and (c.atom_id, c.segment) in segs) or
+                (layers and (c.atom_id, c.segment, c.layer) in layers)
             )
-        ]
-        deleted_count = initial_count - len(self.animation_file.clips)
-        self.log_requested.emit(f"Deleted {deleted_count} clip(s).")
-        self.mark_as_dirty()
+            (deleted_clips if is_deleted else kept_clips).append(c)
+        self.animation_file.clips = kept_clips
+        self.log_requested.emit(f"Deleted {len(deleted_clips)} clip(s).")
+        # The view drops just the deleted items instead of rebuilding the tree.
+        self.mark_as_dirty(refresh_tree=False)
+        self.clips_removed.emit(deleted_clips)
 
     def save_file(self, file_name):
         if not self.animation_file:
@@ -382,7 +524,7 @@ class AppLogic(QObject):
                             storable_data["Animation"]["Clips"] = []
                 
                 grouped_clips = defaultdict(list)
-                for clip in self.animation_file.clips:
+                for clip in self.animation_file.ordered_clips():
                     grouped_clips[(clip.atom_id, clip.storable_id)].append(clip)
                 
                 for atom_data in scene_json.get("atoms", []):
@@ -391,15 +533,14 @@ class AppLogic(QObject):
                         storable_id = storable_data.get("id", "")
                         if "_VamTimeline.AtomPlugin" in storable_id:
                             key = (atom_id, storable_id)
-                            clips_for_plugin = sorted(grouped_clips.get(key, []), key=lambda c: c.order_index)
                             if "Animation" in storable_data:
-                                storable_data["Animation"]["Clips"] = [c.to_dict() for c in clips_for_plugin]
+                                storable_data["Animation"]["Clips"] = [c.to_dict() for c in grouped_clips.get(key, [])]
                 
                 output_data = scene_json
             else:
                 output_data = self.animation_file.to_dict()
 
-            with open(clean_path, 'w', encoding='utf-8') as f:
+            with _open_for_save(clean_path) as f:
                 json.dump(output_data, f, indent=3, ensure_ascii=False)
             
             self.current_file_path = clean_path
@@ -446,34 +587,36 @@ class AppLogic(QObject):
 
     def create_new_segment(self, name):
         if not self.animation_file: return
-        if any(c.segment == name for c in self.animation_file.clips):
+        if any(seg == name for _, seg in self._get_segment_keys()):
             self.error_occurred.emit("Name Conflict", f"Segment '{name}' already exists.")
             return
-        max_order = max((c.order_index for c in self.animation_file.clips), default=-1)
+        max_order = self._get_max_order_index()
         atom_id = self.animation_file.clips[0].atom_id if self.animation_file.clips else "(Standalone)"
         new_clip = AnimationClip(name="New Animation", segment=name, layer="Main", length=1.0, order_index=max_order + 1, atom_id=atom_id)
         self.animation_file.clips.append(new_clip)
         self.log_requested.emit(f"Created segment '{name}'.")
-        self.mark_as_dirty()
+        self.mark_as_dirty(refresh_tree=False)
+        self.clips_added.emit([new_clip])
 
     def duplicate_clip(self, clip_obj):
         base, new_name = clip_obj.name, f"{clip_obj.name} (copy)"
         counter = 2
-        existing_names = {c.name for c in self.animation_file.clips if c.atom_id == clip_obj.atom_id and c.segment == clip_obj.segment and c.layer == clip_obj.layer}
+        existing_names = {c.name for c in self.get_layer_clips(clip_obj.atom_id, clip_obj.segment, clip_obj.layer)}
         while new_name in existing_names:
             new_name = f"{base} (copy {counter})"
             counter += 1
         
-        new_clip = copy.deepcopy(clip_obj)
+        new_clip = clip_obj.clone()
         new_clip.name = new_name
-        new_clip.order_index = max((c.order_index for c in self.animation_file.clips), default=-1) + 1
+        new_clip.order_index = self._get_max_order_index() + 1
         self.animation_file.clips.append(new_clip)
         
         self.log_requested.emit(f"Duplicated '{clip_obj.name}' as '{new_name}'.")
-        self.mark_as_dirty()
+        self.mark_as_dirty(refresh_tree=False)
+        self.clips_added.emit([new_clip])
 
     def batch_rename_clips(self, clips_to_rename, find, replace, prefix, suffix):
-        renamed_count = 0
+        renamed_clips = []
         for clip in clips_to_rename:
             original_name, new_name = clip.name, clip.name
             if find: new_name = new_name.replace(find, replace)
@@ -481,20 +624,24 @@ class AppLogic(QObject):
             if suffix: new_name = new_name + suffix
             
             if new_name != original_name:
-                is_conflict = any(c.name == new_name and c.atom_id == clip.atom_id and c.layer == clip.layer and c.segment == clip.segment for c in self.animation_file.clips if c is not clip)
+                # Name conflicts and NextAnimationName references are both scoped to the clip's layer.
+                layer_clips = self.get_layer_clips(clip.atom_id, clip.segment, clip.layer)
+                is_conflict = any(c.name == new_name for c in layer_clips if c is not clip)
                 if is_conflict:
                     self.log_requested.emit(f"SKIPPED rename for '{original_name}' due to name conflict.")
                     continue
                 
                 clip.name = new_name
-                for other_clip in self.animation_file.clips:
-                    if other_clip.other_properties.get("NextAnimationName") == original_name and other_clip.atom_id == clip.atom_id and other_clip.layer == clip.layer and other_clip.segment == clip.segment:
+                for other_clip in layer_clips:
+                    if other_clip.other_properties.get("NextAnimationName") == original_name:
                         other_clip.other_properties["NextAnimationName"] = new_name
-                renamed_count += 1
+                renamed_clips.append(clip)
         
-        if renamed_count > 0:
-            self.log_requested.emit(f"Batch renamed {renamed_count} clip(s).")
-            self.mark_as_dirty()
+        if renamed_clips:
+            self.log_requested.emit(f"Batch renamed {len(renamed_clips)} clip(s).")
+            # Only clip names changed, so the tree relabels these items instead of rebuilding.
+            self.mark_as_dirty(refresh_tree=False)
+            self.clips_renamed.emit(renamed_clips)
 
     def rename_item(self, data, new_name):
         if not self.animation_file or not new_name:
@@ -505,7 +652,9 @@ class AppLogic(QObject):
             clip, old_name = data, data.name
             if new_name == old_name: return
             
-            if any(c is not clip and c.name == new_name and c.layer == clip.layer and c.segment == clip.segment and c.atom_id == clip.atom_id for c in self.animation_file.clips):
+            # Name conflicts and NextAnimationName references are both scoped to the clip's layer.
+            layer_clips = self.get_layer_clips(clip.atom_id, clip.segment, clip.layer)
+            if any(c is not clip and c.name == new_name for c in layer_clips):
                 self.error_occurred.emit("Name Conflict", f"A clip named '{new_name}' already exists in this layer.")
                 self.clips_updated.emit()
                 return
@@ -513,38 +662,40 @@ class AppLogic(QObject):
             clip.name = new_name
             self.log_requested.emit(f"Renamed clip '{old_name}' to '{new_name}'.")
             
-            for other_clip in self.animation_file.clips:
-                if other_clip.other_properties.get("NextAnimationName") == old_name and other_clip.atom_id == clip.atom_id and other_clip.segment == clip.segment and other_clip.layer == clip.layer:
+            for other_clip in layer_clips:
+                if other_clip.other_properties.get("NextAnimationName") == old_name:
                     other_clip.other_properties["NextAnimationName"] = new_name
                     self.log_requested.emit(f"Updated NextAnimationName for '{other_clip.name}'.")
-            self.mark_as_dirty()
+            self.mark_as_dirty(refresh_tree=False)
+            self.clips_renamed.emit([clip])
         
         elif isinstance(data, tuple):
             item_type = data[0]
             if item_type == 'segment':
                 atom_id, old_name = data[1], data[2]
                 if new_name == old_name: return
-                if any(c.segment == new_name and c.atom_id == atom_id for c in self.animation_file.clips):
+                if (atom_id, new_name) in self._get_segment_keys():
                     self.error_occurred.emit("Name Conflict", f"Segment '{new_name}' already exists for this atom.")
                     self.clips_updated.emit()
                     return
-                for clip in self.animation_file.clips:
-                    if clip.atom_id == atom_id and clip.segment == old_name:
-                        clip.segment = new_name
+                for (a_id, seg, _), layer_clips in self._get_layer_index().items():
+                    if a_id == atom_id and seg == old_name:
+                        for clip in layer_clips: clip.segment = new_name
                 self.log_requested.emit(f"Renamed segment '{old_name}' to '{new_name}'.")
-                self.mark_as_dirty()
+                self.mark_as_dirty(refresh_tree=False)
+                self.branch_renamed.emit(data, new_name)
             elif item_type == 'layer':
                 atom_id, seg_name, old_layer_name = data[1], data[2], data[3]
                 if new_name == old_layer_name: return
-                if any(c.layer == new_name and c.segment == seg_name and c.atom_id == atom_id for c in self.animation_file.clips):
+                if (atom_id, seg_name, new_name) in self._get_layer_index():
                     self.error_occurred.emit("Name Conflict", f"Layer '{new_name}' already exists in this segment.")
                     self.clips_updated.emit()
                     return
-                for clip in self.animation_file.clips:
-                    if clip.atom_id == atom_id and clip.segment == seg_name and clip.layer == old_layer_name:
-                        clip.layer = new_name
+                for clip in self.get_layer_clips(atom_id, seg_name, old_layer_name):
+                    clip.layer = new_name
                 self.log_requested.emit(f"Renamed layer '{old_layer_name}' to '{new_name}'.")
-                self.mark_as_dirty()
+                self.mark_as_dirty(refresh_tree=False)
+                self.branch_renamed.emit(data, new_name)
     
     def _apply_position_delta_to_clips(self, clips, delta):
         processed_count = 0
@@ -559,18 +710,13 @@ class AppLogic(QObject):
                         current_delta = delta[axis_idx]
                         if math.isclose(current_delta, 0.0, abs_tol=1e-6): continue
 
-                        new_keyframes, last_v, last_c = [], 0.0, 3
-                        
                         sorted_kfs = sorted(
                             [KeyframeDecoder.decode_keyframe(kf, 0.0, 3) for kf in controller.properties.get(axis, [])],
                             key=lambda k: k[0]
                         )
-                        for t, v, c in sorted_kfs:
-                            new_v = v + current_delta
-                            new_kf_str = KeyframeEncoder.encode_keyframe(t, new_v, c, last_v, last_c)
-                            new_keyframes.append(new_kf_str)
-                            last_v, last_c = new_v, c
-                        controller.properties[axis] = new_keyframes
+                        controller.properties[axis] = KeyframeEncoder.encode_keyframes(
+                            ((t, v + current_delta, c) for t, v, c in sorted_kfs), last_v=0.0, last_c=3
+                        )
                 processed_count += 1
             except Exception as e:
                 self.log_requested.emit(f"ERROR: Failed to process clip '{clip.name}'. Reason: {e}")
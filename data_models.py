@@ -1,33 +1,53 @@
 # data_models.py
+import bisect
+import sys
 from collections import defaultdict
 import copy
 from keyframe_logic import KeyframeEncoder # Ważny import!
 
+# The model classes use __slots__: large scenes hold thousands of clips and many more targets.
+
+def _intern(value):
+    """Interns names that repeat across clips (storables, controllers, segments, layers) so they share one object."""
+    return sys.intern(value) if type(value) is str else value
+
 class FloatParameter:
+    __slots__ = ("storable", "name", "value", "min", "max")
+
     def __init__(self, storable, name, value, min_val, max_val):
         self.storable, self.name, self.value, self.min, self.max = storable, name, value, min_val, max_val
     @classmethod
-    def from_dict(cls, data): return cls(data.get("Storable"), data.get("Name"), data.get("Value", []), data.get("Min"), data.get("Max"))
+    def from_dict(cls, data): return cls(_intern(data.get("Storable")), _intern(data.get("Name")), data.get("Value", []), data.get("Min"), data.get("Max"))
     def to_dict(self):
         props = {"Storable": self.storable, "Name": self.name, "Value": self.value}
         if self.min is not None: props["Min"] = self.min
         if self.max is not None: props["Max"] = self.max
         return props
+    def clone(self): return FloatParameter(self.storable, self.name, list(self.value), self.min, self.max)
 
 class ControllerTarget:
+    __slots__ = ("id", "properties")
+    AXES = ('X', 'Y', 'Z', 'RotX', 'RotY', 'RotZ', 'RotW')
+
     def __init__(self, controller_id, **kwargs):
         self.id, self.properties = controller_id, kwargs
-        for key in ['X', 'Y', 'Z', 'RotX', 'RotY', 'RotZ', 'RotW']:
-            if key not in self.properties: self.properties[key] = []
+        # Missing axes are appended after the given keys, which keeps the saved key order.
+        for key in self.AXES:
+            if key not in kwargs: kwargs[key] = []
     @classmethod
     def from_dict(cls, data):
-        controller_id = data.get("Controller")
+        controller_id = _intern(data.get("Controller"))
         return cls(controller_id, **{k: v for k, v in data.items() if k != "Controller"})
     def to_dict(self):
         data = {"Controller": self.id}; data.update(self.properties); return data
+    def clone(self):
+        # Axis values are lists of immutable keyframe strings, so a list copy is enough for them.
+        return ControllerTarget(self.id, **{k: list(v) if isinstance(v, list) else copy.deepcopy(v) for k, v in self.properties.items()})
 
 class TriggerGroup:
     """Represents a named group of triggers, like 'Audio 1' or 'Triggers 1'."""
+    __slots__ = ("name", "live", "triggers")
+
     def __init__(self, name, live, triggers):
         self.name = name
         self.live = live
@@ -48,7 +68,20 @@ class TriggerGroup:
             "Triggers": self.triggers
         }
 
+    def clone(self):
+        return TriggerGroup(self.name, self.live, copy.deepcopy(self.triggers))
+
+def _float_param_order(param): return (param.storable, param.name)
+def _controller_order(controller): return controller.id
+
 class AnimationClip:
+    __slots__ = (
+        "name", "segment", "layer", "_length", "_length_str", "order_index", "atom_id", "storable_id",
+        "other_properties", "_float_params", "_controllers", "trigger_groups", "_fp_keys", "_ctrl_ids"
+    )
+    # Keys from_dict maps to attributes; everything else is kept in other_properties.
+    _KNOWN_KEYS = frozenset({"AnimationName", "AnimationSegment", "AnimationLayer", "AnimationLength", "FloatParams", "Controllers", "Triggers", "OrderIndex"})
+
     def __init__(self, name, segment, layer, length, order_index=0, atom_id=None, storable_id=None, **kwargs):
         self.name = name
         self.segment = segment
@@ -62,23 +95,82 @@ class AnimationClip:
         self.controllers = []
         self.trigger_groups = []
 
+    # float_params / controllers are kept in save order (see to_dict) and are properties so that
+    # replacing either list sorts it and drops the cached key set built from it.
+    # In-place additions go through add_float_param / add_controller, which keep both up to date.
+    @property
+    def float_params(self):
+        return self._float_params
+
+    @float_params.setter
+    def float_params(self, value):
+        self._float_params = sorted(value, key=_float_param_order)
+        self._fp_keys = None
+
+    @property
+    def controllers(self):
+        return self._controllers
+
+    @controllers.setter
+    def controllers(self, value):
+        self._controllers = sorted(value, key=_controller_order)
+        self._ctrl_ids = None
+
+    def float_param_keys(self):
+        """Returns the set of (storable, name) keys of this clip's float params, built on first use."""
+        if self._fp_keys is None:
+            self._fp_keys = {(p.storable, p.name) for p in self._float_params}
+        return self._fp_keys
+
+    def controller_ids(self):
+        """Returns the set of controller ids animated by this clip, built on first use."""
+        if self._ctrl_ids is None:
+            self._ctrl_ids = {c.id for c in self._controllers}
+        return self._ctrl_ids
+
+    def add_float_param(self, param):
+        bisect.insort(self._float_params, param, key=_float_param_order)
+        if self._fp_keys is not None: self._fp_keys.add((param.storable, param.name))
+
+    def add_controller(self, controller):
+        bisect.insort(self._controllers, controller, key=_controller_order)
+        if self._ctrl_ids is not None: self._ctrl_ids.add(controller.id)
+
+    def invalidate_target_keys(self):
+        """Drops the cached key sets after float_params or controllers were changed in place."""
+        self._fp_keys = None
+        self._ctrl_ids = None
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+        self._length_str = None # Serialized form is rebuilt lazily in to_dict
+
     @classmethod
     def from_dict(cls, data, atom_id=None, storable_id=None, order_index=0):
         """
         Creates an AnimationClip from a dictionary.
         Accepts order_index as a direct keyword argument.
         """
-        known_keys = {"AnimationName", "AnimationSegment", "AnimationLayer", "AnimationLength", "FloatParams", "Controllers", "Triggers", "OrderIndex"}
+        known_keys = cls._KNOWN_KEYS
+        other_properties = {k: v for k, v in data.items() if k not in known_keys} if not data.keys() <= known_keys else {}
+        length = data.get("AnimationLength", 0.0)
         instance = cls(
             name=data.get("AnimationName", "Unnamed"),
-            segment=data.get("AnimationSegment", "Default"),
-            layer=data.get("AnimationLayer", "Default"),
-            length=float(data.get("AnimationLength", 0.0)),
+            segment=_intern(data.get("AnimationSegment", "Default")),
+            layer=_intern(data.get("AnimationLayer", "Default")),
+            length=float(length) if isinstance(length, str) else length,
             order_index=order_index,  # Use the passed argument directly
             atom_id=atom_id,
             storable_id=storable_id,
-            **{k: v for k, v in data.items() if k not in known_keys}
+            **other_properties
         )
+        if isinstance(length, str):
+            instance._length_str = length # Re-emit the original text on save
         if "FloatParams" in data:
             instance.float_params = [FloatParameter.from_dict(p) for p in data["FloatParams"]]
         if "Controllers" in data:
@@ -87,16 +179,31 @@ class AnimationClip:
             instance.trigger_groups = [TriggerGroup.from_dict(tg) for tg in data["Triggers"]]
         return instance
 
+    def clone(self):
+        """Returns an independent copy of this clip. Much faster than copy.deepcopy, which walks every keyframe string."""
+        new_clip = AnimationClip(
+            self.name, self.segment, self.layer, self._length, self.order_index, self.atom_id, self.storable_id,
+            **copy.deepcopy(self.other_properties)
+        )
+        new_clip._length_str = self._length_str
+        # Already in save order, so the lists are assigned directly instead of through the sorting setters.
+        new_clip._float_params = [p.clone() for p in self._float_params]
+        new_clip._controllers = [c.clone() for c in self._controllers]
+        new_clip.trigger_groups = [tg.clone() for tg in self.trigger_groups]
+        return new_clip
+
     def to_dict(self):
+        if self._length_str is None:
+            self._length_str = str(self.length)
         data = {
             "AnimationName": self.name,
             "AnimationSegment": self.segment,
             "AnimationLayer": self.layer,
-            "AnimationLength": str(self.length)
+            "AnimationLength": self._length_str
         }
         data.update(self.other_properties)
-        if self.float_params: data["FloatParams"] = [p.to_dict() for p in sorted(self.float_params, key=lambda p: (p.storable, p.name))]
-        if self.controllers: data["Controllers"] = [c.to_dict() for c in sorted(self.controllers, key=lambda c: c.id)]
+        if self.float_params: data["FloatParams"] = [p.to_dict() for p in self.float_params]
+        if self.controllers: data["Controllers"] = [c.to_dict() for c in self.controllers]
         if self.trigger_groups: data["Triggers"] = [tg.to_dict() for tg in sorted(self.trigger_groups, key=lambda tg: tg.name)]
         return data
 
@@ -108,11 +215,15 @@ class AnimationFile:
         self.is_scene = False
         self.original_json = None
     
+    def ordered_clips(self):
+        """Returns the clips sorted by order_index. Grouping the result keeps that order."""
+        return sorted(self.clips, key=lambda c: c.order_index)
+
     def to_dict(self):
         if self.is_scene:
             raise NotImplementedError("to_dict is not for scene files, handle separately")
         return {
             "SerializeVersion": self.version,
             "AtomType": self.atom_type,
-            "Clips": [c.to_dict() for c in sorted(self.clips, key=lambda c: c.order_index)]
+            "Clips": [c.to_dict() for c in self.ordered_clips()]
         }
\ No newline at end of file
@@ -1,6 +1,14 @@
 # keyframe_logic.py
+import functools
 import struct
 
+# Precompiled packers; the encoder and decoder each convert a keyframe's bytes to/from hex in one call.
+_PACK_F = struct.Struct('<f').pack
+_PACK_B = struct.Struct('<B').pack
+_UNPACK_F = struct.Struct('<f').unpack_from
+# Flag character by (has_value | has_curve_type << 1).
+_FLAG_CHARS = ('A', 'B', 'C', 'D')
+
 class KeyframeEncoder:
     """
     Replicates the keyframe encoding logic from AtomAnimationSerializer.cs.
@@ -8,19 +16,29 @@ class KeyframeEncoder:
     @staticmethod
     def encode_keyframe(time: float, value: float, curve_type: int, last_v: float, last_c: int) -> str:
         """Encodes a single keyframe into the plugin's string format."""
-        sb = []
         has_value = abs(last_v - value) > 1e-7
         has_curve_type = last_c != curve_type
-        encoded_value = 0
-        if has_value: encoded_value |= (1 << 0)
-        if has_curve_type: encoded_value |= (1 << 1)
-        sb.append(chr(ord('A') + encoded_value))
-        sb.append(struct.pack('<f', time).hex().upper())
+        raw = _PACK_F(time)
         if has_value:
-            sb.append(struct.pack('<f', value).hex().upper())
+            raw += _PACK_F(value)
         if has_curve_type:
-            sb.append(struct.pack('<B', curve_type).hex().upper())
-        return "".join(sb)
+            raw += _PACK_B(curve_type)
+        return _FLAG_CHARS[has_value | (has_curve_type << 1)] + raw.hex().upper()
+
+    @staticmethod
+    def encode_keyframes(keyframes, last_v: float = 0.0, last_c: int = -1) -> list[str]:
+        """Encodes a sequence of (time, value, curve_type) keyframes, carrying the delta state between them."""
+        encoded = []
+        for time, value, curve_type in keyframes:
+            encoded.append(KeyframeEncoder.encode_keyframe(time, value, curve_type, last_v, last_c))
+            last_v, last_c = value, curve_type
+        return encoded
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def encode_flat_curve(length: float, value: float) -> tuple[str, str]:
+        """Encodes a constant curve (keyframes at 0 and length, smooth). Cached, since it depends only on its arguments."""
+        return tuple(KeyframeEncoder.encode_keyframes([(0.0, value, 3), (length, value, 3)]))
 
 class KeyframeDecoder:
     """
@@ -34,18 +52,9 @@ class KeyframeDecoder:
         encoded_value = ord(flag_char) - ord('A')
         has_value = (encoded_value & (1 << 0)) != 0
         has_curve_type = (encoded_value & (1 << 1)) != 0
-        ptr = 1
-        time_hex = encoded_str[ptr:ptr+8]
-        time = struct.unpack('<f', bytes.fromhex(time_hex))[0]
-        ptr += 8
-        value = last_v
-        if has_value:
-            value_hex = encoded_str[ptr:ptr+8]
-            value = struct.unpack('<f', bytes.fromhex(value_hex))[0]
-            ptr += 8
-        curve_type = last_c
-        if has_curve_type:
-            curve_type_hex = encoded_str[ptr:ptr+2]
-            curve_type = struct.unpack('<B', bytes.fromhex(curve_type_hex))[0]
-            ptr += 2
-        return time, value, curve_type
\ No newline at end of file
+        # One hex conversion for the whole payload: time (8 chars), optional value (8), optional curve byte (2).
+        raw = bytes.fromhex(encoded_str[1:9 + 8 * has_value + 2 * has_curve_type])
+        time = _UNPACK_F(raw)[0]
+        value = _UNPACK_F(raw, 4)[0] if has_value else last_v
+        curve_type = raw[-1] if has_curve_type else last_c
+        return time, value, curve_type
@@ -1,9 +1,11 @@
 # main.py
 import sys
 import os
-from collections import defaultdict
+import time
+from itertools import groupby
+from operator import attrgetter
 
-from PyQt6.QtCore import Qt, QDateTime, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -17,7 +19,7 @@ from ui_styles import DARK_STYLE
 from data_models import AnimationClip
 from ui_components import (
     AnimationTreeWidget, ClipPropertiesPanel, MergeConflictDialog,
-    BatchRenameDialog, OffsetDialog
+    BatchRenameDialog, OffsetDialog, ROLE_KIND
 )
 from app_logic import AppLogic, MergeError
 
@@ -26,6 +28,23 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.app_logic = AppLogic()
         self.is_first_load = True
+        self.is_loading = False
+        self._tree_items = {} # Items of the current tree: data tuple -> branch item, id(clip) -> clip item
+        self._tree_signature = None # What the last full rebuild showed; None after incremental edits
+        self._pre_filter_state = None # Collapsed branches from before the filter was applied
+
+        # Log lines are buffered and appended to the console in one go, once per event-loop burst.
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(16)
+        self._log_timer.timeout.connect(self._flush_log)
+
+        # Typing in the filter box re-filters once the user pauses, not on every keystroke.
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(lambda: self.filter_tree(self.filter_edit.text()))
 
         self.setWindowTitle("Timeliner")
         ico_path = os.path.join(getattr(sys, '_MEIPASS', os.path.abspath('.')), 'timeliner-logo.ico')
@@ -65,29 +84,42 @@ class MainWindow(QMainWindow):
         toolbar=self.addToolBar("Main Toolbar");toolbar.addAction(self.open_action);toolbar.addAction(self.save_as_action);toolbar.addSeparator();toolbar.addAction(self.new_segment_action);toolbar.addAction(self.delete_action)
         
         main_widget=QWidget();self.setCentralWidget(main_widget);main_layout=QHBoxLayout(main_widget)
-        left_panel=QWidget();left_layout=QVBoxLayout(left_panel);left_panel.setFixedWidth(400);filter_layout=QHBoxLayout();self.filter_edit = QLineEdit();self.filter_edit.setPlaceholderText("Filter animations...");self.filter_edit.textChanged.connect(self.filter_tree);filter_layout.addWidget(self.filter_edit)
+        left_panel=QWidget();left_layout=QVBoxLayout(left_panel);left_panel.setFixedWidth(400);filter_layout=QHBoxLayout();self.filter_edit = QLineEdit();self.filter_edit.setPlaceholderText("Filter animations...");self.filter_edit.textChanged.connect(self._schedule_filter);filter_layout.addWidget(self.filter_edit)
         self.fold_all_button=QPushButton("Fold All");self.fold_all_button.clicked.connect(self.fold_all_items);filter_layout.addWidget(self.fold_all_button)
         self.unfold_all_button=QPushButton("Unfold All");self.unfold_all_button.clicked.connect(self.unfold_all_items);filter_layout.addWidget(self.unfold_all_button)
         left_layout.addLayout(filter_layout)
         self.tree=AnimationTreeWidget(self);self.tree.setHeaderLabels(["Atom / Segment / Layer / Animation"]);self.tree.itemSelectionChanged.connect(self.on_tree_selection_changed);self.tree.itemChanged.connect(self.on_item_renamed);left_layout.addWidget(self.tree)
-        right_panel=QWidget();right_layout=QVBoxLayout(right_panel)
+        right_panel=QWidget();right_layout=self.right_layout=QVBoxLayout(right_panel)
         self.placeholder_label=QLabel("Select a clip to see its properties.");self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.properties_panel=ClipPropertiesPanel(self)
+        self.properties_panel=None # Built on the first clip selection, see on_tree_selection_changed
         self.log_console=QPlainTextEdit();self.log_console.setReadOnly(True);self.log_console.setFixedHeight(150);self.log_console.setObjectName("LogConsole")
-        right_layout.addWidget(self.placeholder_label);right_layout.addWidget(self.properties_panel);right_layout.addStretch(1);right_layout.addWidget(QLabel("<b>Console Log</b>"));right_layout.addWidget(self.log_console)
+        right_layout.addWidget(self.placeholder_label);right_layout.addStretch(1);right_layout.addWidget(QLabel("<b>Console Log</b>"));right_layout.addWidget(self.log_console)
         main_layout.addWidget(left_panel);main_layout.addWidget(right_panel)
 
     def connect_signals(self):
         self.app_logic.file_changed.connect(self.on_file_changed)
         self.app_logic.clips_updated.connect(self.populate_animation_tree)
+        self.app_logic.layer_reordered.connect(self.on_layer_reordered)
+        self.app_logic.clips_added.connect(self.on_clips_added)
+        self.app_logic.clips_removed.connect(self.on_clips_removed)
+        self.app_logic.clips_renamed.connect(self.on_clips_renamed)
+        self.app_logic.branch_renamed.connect(self.on_branch_renamed)
         self.app_logic.log_requested.connect(self.log_message)
         self.app_logic.error_occurred.connect(self.show_error_message)
 
     def on_file_changed(self, file_path):
+        if self.is_loading: # A background load finished (successfully or not)
+            self.is_loading = False
+            self.setEnabled(True)
+            QApplication.restoreOverrideCursor()
+
         title = f"Timeliner - {file_path}" if file_path else "Timeliner"
         self.setWindowTitle(title)
         
-        if file_path and not file_path.endswith("*"):
+        if file_path and file_path.endswith("*"):
+            return # Only the dirty marker changed; edits refresh the tree themselves
+
+        if file_path:
             clean_path = self.app_logic.current_file_path.replace(" *", "")
             if os.path.exists(clean_path):
                  self.last_directory = os.path.dirname(clean_path)
@@ -97,29 +129,42 @@ class MainWindow(QMainWindow):
         self.populate_animation_tree()
 
     def get_tree_state(self):
-        """Saves the expansion state of the tree."""
+        """Saves which atom/segment/layer branches of the tree are collapsed."""
         state = set()
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item.isExpanded():
-                data = item.data(0, 1000)
-                if data: state.add(data)
-            self._get_tree_state_recursive(item, state)
+        self._get_tree_state_recursive(self.tree.invisibleRootItem(), state)
         return state
 
     def _get_tree_state_recursive(self, parent_item, state):
         for i in range(parent_item.childCount()):
             item = parent_item.child(i)
-            if item.isExpanded():
-                data = item.data(0, 1000)
-                if data: state.add(data)
+            data = item.data(0, 1000)
+            if not isinstance(data, tuple): continue # Clip items have no children
+            if not item.isExpanded(): state.add(data)
             self._get_tree_state_recursive(item, state)
 
+    def _get_tree_signature(self, animation_file):
+        """Everything the tree shows for the file: each clip (by identity) with its place and label."""
+        if not animation_file: return None
+        return (animation_file.is_scene, tuple((c, c.atom_id, c.segment, c.layer, c.name, c.order_index) for c in animation_file.clips))
+
     def populate_animation_tree(self):
+        # Edits that only change keyframes or properties still refresh through here; the tree is left as is.
+        signature = self._get_tree_signature(self.app_logic.animation_file)
+        if signature is not None and signature == self._tree_signature:
+            self.on_tree_selection_changed()
+            return
+        self._tree_signature = signature
+
+        # No repaints, re-sorts or item signals while the tree is torn down and rebuilt.
+        sorting_enabled = self.tree.isSortingEnabled()
+        self.tree.setSortingEnabled(False)
+        self.tree.setUpdatesEnabled(False)
         self.tree.blockSignals(True)
         
         try:
-            expansion_state = self.get_tree_state() if not self.is_first_load else None
+            # Branches not recorded as collapsed are expanded, so new segments and layers show up open.
+            collapsed_state = self.get_tree_state() if not self.is_first_load else set()
+            self.is_first_load = False
             
             current_selection_key = None
             selected_items = self.tree.selectedItems()
@@ -128,95 +173,256 @@ class MainWindow(QMainWindow):
                 current_selection_key = id(data) if isinstance(data, AnimationClip) else data
 
             self.tree.clear()
+            self._tree_items = {}
             
             animation_file = self.app_logic.animation_file
             if not animation_file:
                 self.on_tree_selection_changed()
                 return
 
-            root_item = self.tree.invisibleRootItem()
             self.tree.setHeaderLabels(["Atom / Segment / Layer / Animation" if animation_file.is_scene else "Segment / Layer / Animation"])
 
-            new_item_to_select = self._populate_recursive(root_item, animation_file.clips, current_selection_key, expansion_state)
-            
-            if self.is_first_load:
-                self.tree.expandAll()
-                self.is_first_load = False
+            # Items are built detached and attached in one batch; expansion only applies once they are in the tree.
+            # One sort puts the clips in tree order (names, then order_index within a layer); the builders
+            # only group consecutive runs. The sort is stable, so equal order indices keep file order.
+            sort_key = attrgetter("atom_id", "segment", "layer", "order_index") if animation_file.is_scene else attrgetter("segment", "layer", "order_index")
+            items_to_collapse = []
+            top_items, new_item_to_select = self._build_tree_items(sorted(animation_file.clips, key=sort_key), current_selection_key, collapsed_state, items_to_collapse)
+            self.tree.insertTopLevelItems(0, top_items)
+            # Everything opens in one pass; only the few branches the user had collapsed are closed again.
+            self.tree.expandAll()
+            for item in items_to_collapse:
+                item.setExpanded(False)
 
             if new_item_to_select:
                 self.tree.setCurrentItem(new_item_to_select)
 
         finally:
             self.tree.blockSignals(False)
+            self.tree.setSortingEnabled(sorting_enabled)
+            self.tree.setUpdatesEnabled(True)
         
         self.on_tree_selection_changed()
     
-    def _populate_recursive(self, parent_item, clips, selection_key, expansion_state):
-        item_to_reselect = None
-        if not self.app_logic.animation_file: return None
-        is_scene = self.app_logic.animation_file.is_scene
-        
-        # Atom level (only for scene files and root parent)
-        if is_scene and parent_item == self.tree.invisibleRootItem():
-            grouped = defaultdict(list)
-            for clip in clips: grouped[clip.atom_id].append(clip)
-            for atom_id, atom_clips in sorted(grouped.items()):
-                atom_item_data = ("atom", atom_id)
-                atom_item = QTreeWidgetItem(parent_item, [f"Atom: {atom_id}"])
-                atom_item.setData(0, 1000, atom_item_data)
-                atom_item.setFlags(atom_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                if expansion_state and atom_item_data in expansion_state:
-                    atom_item.setExpanded(True)
-                if atom_item_data == selection_key: item_to_reselect = atom_item
-                result = self._populate_recursive(atom_item, atom_clips, selection_key, expansion_state)
-                if result: item_to_reselect = result
-            return item_to_reselect
-
-        # Segment level
-        grouped = defaultdict(list)
-        for clip in clips: grouped[clip.segment].append(clip)
-        for seg_name, seg_clips in sorted(grouped.items()):
-            atom_id_data = parent_item.data(0, 1000)
-            atom_id = atom_id_data[1] if isinstance(atom_id_data, tuple) and atom_id_data[0] == 'atom' else "(Standalone)"
+    def on_layer_reordered(self, layer_data):
+        """Re-sorts the clip items of one layer in place instead of rebuilding the whole tree."""
+        self._tree_signature = None
+        layer_item = self._tree_items.get(layer_data)
+        if layer_item is None:
+            self.populate_animation_tree()
+            return
+
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            current_item = self.tree.currentItem()
+            clip_items = layer_item.takeChildren()
+            selected_items = [item for item in clip_items if item.isSelected()]
+            clip_items.sort(key=lambda item: item.data(0, 1000).order_index)
+            layer_item.addChildren(clip_items)
+            if current_item in clip_items:
+                self.tree.setCurrentItem(current_item)
+            for item in selected_items:
+                item.setSelected(True)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+    def _build_tree_items(self, clips, selection_key, collapsed_state, items_to_collapse):
+        """Builds the top-level items for the given clips without attaching them to the tree."""
+        if not self.app_logic.animation_file.is_scene:
+            return self._build_segment_items("(Standalone)", clips, selection_key, collapsed_state, items_to_collapse)
+
+        # Atom level (only for scene files)
+        atom_items, item_to_reselect = [], None
+        for atom_id, atom_clips in groupby(clips, key=attrgetter("atom_id")):
+            atom_item_data = ("atom", atom_id)
+            atom_item = self._new_tree_item(f"Atom: {atom_id}", atom_item_data, "atom", editable=False)
+            if atom_item_data in collapsed_state:
+                items_to_collapse.append(atom_item)
+            if atom_item_data == selection_key: item_to_reselect = atom_item
+            seg_items, result = self._build_segment_items(atom_id, atom_clips, selection_key, collapsed_state, items_to_collapse)
+            atom_item.addChildren(seg_items)
+            if result: item_to_reselect = result
+            atom_items.append(atom_item)
+        return atom_items, item_to_reselect
+
+    def _build_segment_items(self, atom_id, clips, selection_key, collapsed_state, items_to_collapse):
+        seg_items, item_to_reselect = [], None
+        for seg_name, seg_clips in groupby(clips, key=attrgetter("segment")):
             seg_item_data = ("segment", atom_id, seg_name)
-            seg_item = QTreeWidgetItem(parent_item, [f"Segment: {seg_name}"])
-            seg_item.setData(0, 1000, seg_item_data)
-            seg_item.setFlags(seg_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            if expansion_state and seg_item_data in expansion_state:
-                seg_item.setExpanded(True)
+            seg_item = self._new_tree_item(f"Segment: {seg_name}", seg_item_data, "segment")
+            if seg_item_data in collapsed_state:
+                items_to_collapse.append(seg_item)
             if seg_item_data == selection_key: item_to_reselect = seg_item
 
             # Layer level
-            layer_grouped = defaultdict(list)
-            for clip in seg_clips: layer_grouped[clip.layer].append(clip)
-            for layer_name, layer_clips in sorted(layer_grouped.items()):
+            layer_items = []
+            for layer_name, layer_clips in groupby(seg_clips, key=attrgetter("layer")):
                 layer_item_data = ("layer", atom_id, seg_name, layer_name)
-                layer_item = QTreeWidgetItem(seg_item, [f"  Layer: {layer_name}"])
-                layer_item.setData(0, 1000, layer_item_data)
-                layer_item.setFlags(layer_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                if expansion_state and layer_item_data in expansion_state:
-                    layer_item.setExpanded(True)
+                layer_item = self._new_tree_item(f"  Layer: {layer_name}", layer_item_data, "layer")
+                if layer_item_data in collapsed_state:
+                    items_to_collapse.append(layer_item)
                 if layer_item_data == selection_key: item_to_reselect = layer_item
                 
                 # Clip level
-                for clip_obj in sorted(layer_clips, key=lambda c: c.order_index):
-                    clip_item = QTreeWidgetItem(layer_item, [f"    Clip: {clip_obj.name}"])
-                    clip_item.setData(0, 1000, clip_obj)
-                    clip_item.setFlags(clip_item.flags() | Qt.ItemFlag.ItemIsEditable)
+                clip_items = []
+                for clip_obj in layer_clips:
+                    clip_item = self._new_tree_item(f"    Clip: {clip_obj.name}", clip_obj, "clip")
                     if selection_key and isinstance(selection_key, int) and id(clip_obj) == selection_key: 
                         item_to_reselect = clip_item
-        return item_to_reselect
+                    clip_items.append(clip_item)
+                layer_item.addChildren(clip_items)
+                layer_items.append(layer_item)
+            seg_item.addChildren(layer_items)
+            seg_items.append(seg_item)
+        return seg_items, item_to_reselect
+
+    def _new_tree_item(self, text, data, kind, editable=True):
+        """Creates a tree item and registers it in _tree_items (branches by data tuple, clips by id)."""
+        item = QTreeWidgetItem([text])
+        item.setData(0, 1000, data)
+        item.setData(0, ROLE_KIND, kind)
+        if editable:
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+        else:
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self._tree_items[id(data) if kind == "clip" else data] = item
+        return item
+
+    def on_clips_added(self, clips):
+        """Inserts items for new clips, creating their atom/segment/layer branches where missing."""
+        self._tree_signature = None
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            is_scene = self.app_logic.animation_file.is_scene
+            root = self.tree.invisibleRootItem()
+            for clip in clips:
+                atom_id = clip.atom_id if is_scene else "(Standalone)"
+                parent = self._get_or_insert_branch(root, ("atom", atom_id), f"Atom: {atom_id}", "atom", editable=False) if is_scene else root
+                parent = self._get_or_insert_branch(parent, ("segment", atom_id, clip.segment), f"Segment: {clip.segment}", "segment")
+                parent = self._get_or_insert_branch(parent, ("layer", atom_id, clip.segment, clip.layer), f"  Layer: {clip.layer}", "layer")
+                # Clips are listed by order_index; equal indices keep insertion order, as in a full rebuild.
+                index = parent.childCount()
+                while index > 0 and parent.child(index - 1).data(0, 1000).order_index > clip.order_index:
+                    index -= 1
+                parent.insertChild(index, self._new_tree_item(f"    Clip: {clip.name}", clip, "clip"))
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+    def _get_or_insert_branch(self, parent, data, text, kind, editable=True):
+        item = self._tree_items.get(data)
+        if item is None:
+            # Branches are sorted by name, like the grouping in _build_segment_items.
+            index = 0
+            while index < parent.childCount() and parent.child(index).data(0, 1000)[-1] < data[-1]:
+                index += 1
+            item = self._new_tree_item(text, data, kind, editable)
+            parent.insertChild(index, item)
+            item.setExpanded(True)
+        return item
+
+    def on_clips_removed(self, clips):
+        """Removes the items of deleted clips, along with any branch left empty."""
+        self._tree_signature = None
+        root = self.tree.invisibleRootItem()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            for clip in clips:
+                item = self._tree_items.pop(id(clip), None)
+                if item is None: continue
+                parent = item.parent()
+                parent.removeChild(item)
+                while parent is not None and parent.childCount() == 0:
+                    del self._tree_items[parent.data(0, 1000)]
+                    grandparent = parent.parent()
+                    (grandparent or root).removeChild(parent)
+                    parent = grandparent
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+        self.on_tree_selection_changed()
+
+    def on_clips_renamed(self, clips):
+        """Relabels the items of renamed clips in place."""
+        self._tree_signature = None
+        self.tree.blockSignals(True)
+        try:
+            for clip in clips:
+                item = self._tree_items.get(id(clip))
+                if item is not None: item.setText(0, f"    Clip: {clip.name}")
+        finally:
+            self.tree.blockSignals(False)
+
+        self.on_tree_selection_changed()
+
+    def on_branch_renamed(self, old_data, new_name):
+        """Renames a segment or layer item in place, re-keying it and its descendants and keeping siblings sorted."""
+        self._tree_signature = None
+        item = self._tree_items.get(old_data)
+        if item is None:
+            self.populate_animation_tree()
+            return
+
+        name_pos = len(old_data) - 1 # Segment name for segments, layer name for layers
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            branches, stack = [], [item]
+            while stack:
+                branch = stack.pop()
+                data = branch.data(0, 1000)
+                if not isinstance(data, tuple): continue
+                new_data = data[:name_pos] + (new_name,) + data[name_pos + 1:]
+                del self._tree_items[data]
+                self._tree_items[new_data] = branch
+                branch.setData(0, 1000, new_data)
+                branches.append((branch, branch.isExpanded()))
+                stack.extend(branch.child(i) for i in range(branch.childCount()))
+            item.setText(0, f"Segment: {new_name}" if old_data[0] == "segment" else f"  Layer: {new_name}")
+
+            # Branches are sorted by name; move the item only if the new name changes its place.
+            parent = item.parent() or self.tree.invisibleRootItem()
+            old_index = parent.indexOfChild(item)
+            new_index = 0
+            while new_index < parent.childCount() and (new_index == old_index or parent.child(new_index).data(0, 1000)[-1] < new_name):
+                new_index += 1
+            new_index -= new_index > old_index # The item itself was counted before its new place
+            if new_index != old_index:
+                current_item, selected_items = self.tree.currentItem(), self.tree.selectedItems()
+                parent.insertChild(new_index, parent.takeChild(old_index))
+                for branch, expanded in branches:
+                    branch.setExpanded(expanded)
+                if current_item is not None: self.tree.setCurrentItem(current_item)
+                for selected in selected_items:
+                    selected.setSelected(True)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+        self.on_tree_selection_changed()
 
     def log_message(self, message):
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        self.log_console.appendPlainText(f"[{timestamp}] {message}")
+        timestamp = time.strftime("%H:%M:%S")
+        self._log_buffer.append(f"[{timestamp}] {message}")
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if self._log_buffer:
+            self.log_console.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
 
     def show_error_message(self, title, message):
         QMessageBox.critical(self, title, message)
         self.log_message(f"ERROR: {title} - {message}")
 
     def open_file(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Open Animation or Scene File", self.last_directory, "JSON Files (*.json)")
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Animation or Scene File", self.last_directory, "JSON Files (*.json *.json.gz)")
         if not file_name: 
             return
 
@@ -236,11 +442,18 @@ class MainWindow(QMainWindow):
             if clicked_btn == merge_btn:
                 self.handle_merge_file(file_name)
             elif clicked_btn == replace_btn:
-                self.app_logic.load_file(file_name)
+                self.load_file_in_background(file_name)
             else: # Cancel
                 return
         else:
-            self.app_logic.load_file(file_name)
+            self.load_file_in_background(file_name)
+
+    def load_file_in_background(self, file_name):
+        """Parses the file on a worker thread; the window keeps painting but takes no input until it is loaded."""
+        self.is_loading = True
+        self.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self.app_logic.load_file_async(file_name)
 
     def handle_merge_file(self, file_to_merge):
         try:
@@ -264,11 +477,15 @@ class MainWindow(QMainWindow):
         
         current_path = (self.app_logic.current_file_path or "").replace(" *", "")
         start_path = self.last_directory or current_path or ""
-        file_name, _ = QFileDialog.getSaveFileName(self, "Save As", start_path, "JSON Files (*.json)")
+        file_name, selected_filter = QFileDialog.getSaveFileName(self, "Save As", start_path, "JSON Files (*.json);;Compressed JSON Files (*.json.gz)")
         if file_name:
-            if not file_name.lower().endswith('.json'): file_name += '.json'
+            if not file_name.lower().endswith(('.json', '.json.gz')):
+                file_name += '.json.gz' if selected_filter.startswith("Compressed") else '.json'
             self.app_logic.save_file(file_name)
 
+    def selected_clips(self):
+        return [item.data(0, 1000) for item in self.tree.selectedItems() if item.data(0, ROLE_KIND) == 'clip']
+
     def delete_selected_items(self):
         selected_data = [item.data(0, 1000) for item in self.tree.selectedItems()]
         if not selected_data: return
@@ -278,14 +495,14 @@ class MainWindow(QMainWindow):
             self.app_logic.delete_items(selected_data)
 
     def center_root_on_first_frame(self):
-        selected_clips = [item.data(0, 1000) for item in self.tree.selectedItems() if isinstance(item.data(0, 1000), AnimationClip)]
+        selected_clips = self.selected_clips()
         if not selected_clips:
             QMessageBox.warning(self, "No Selection", "Please select one or more clips to process.")
             return
         self.app_logic.center_root_on_first_frame(selected_clips)
         
     def move_root_by_offset(self):
-        selected_clips = [item.data(0, 1000) for item in self.tree.selectedItems() if isinstance(item.data(0, 1000), AnimationClip)]
+        selected_clips = self.selected_clips()
         if not selected_clips:
             QMessageBox.warning(self, "Invalid Selection", "Please select valid animation clips.")
             return
@@ -314,6 +531,8 @@ class MainWindow(QMainWindow):
                 new_text = new_text_raw.replace(prefix, "", 1)
                 break
         
+        # A rejected rename refreshes the tree to undo the edited text, so it must not be skipped as unchanged.
+        self._tree_signature = None
         self.app_logic.rename_item(data, new_text.strip())
 
     def create_new_segment(self):
@@ -326,13 +545,13 @@ class MainWindow(QMainWindow):
 
     def duplicate_selected_clip(self):
         item = self.tree.currentItem()
-        if not item or not isinstance(item.data(0, 1000), AnimationClip):
+        if not item or item.data(0, ROLE_KIND) != 'clip':
             self.log_message("Please select a single clip to duplicate.")
             return
         self.app_logic.duplicate_clip(item.data(0, 1000))
 
     def batch_rename_items(self):
-        selected_clips = [item.data(0, 1000) for item in self.tree.selectedItems() if isinstance(item.data(0, 1000), AnimationClip)]
+        selected_clips = self.selected_clips()
         if not selected_clips:
             QMessageBox.information(self, "Info", "Select clips to rename.")
             return
@@ -344,34 +563,45 @@ class MainWindow(QMainWindow):
         
     def on_tree_selection_changed(self):
         selected = self.tree.selectedItems()
-        if selected and isinstance(selected[0].data(0, 1000), AnimationClip):
+        if selected and selected[0].data(0, ROLE_KIND) == 'clip':
+            if self.properties_panel is None:
+                self.properties_panel = ClipPropertiesPanel(self)
+                self.right_layout.insertWidget(1, self.properties_panel)
             self.properties_panel.display_clip_properties(selected[0].data(0, 1000), selected[0])
             self.placeholder_label.hide()
         else:
-            self.properties_panel.clear()
+            if self.properties_panel is not None: self.properties_panel.clear()
             self.placeholder_label.show()
 
+    def _schedule_filter(self, text):
+        self._filter_timer.start()
+
     def filter_tree(self, text):
-        search_text = text.lower()
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            self._filter_recursive(root.child(i), search_text)
-
-    def _filter_recursive(self, item, search_text):
-        item_text_visible = search_text in item.text(0).lower()
-        child_visible = False
-        for i in range(item.childCount()):
-            if self._filter_recursive(item.child(i), search_text):
-                child_visible = True
-        
-        is_visible = item_text_visible or child_visible
-        item.setHidden(not is_visible)
-        if search_text and is_visible:
-            parent = item.parent()
-            while parent:
-                parent.setExpanded(True)
-                parent = parent.parent()
-        return is_visible
+        is_filtering = bool(text)
+        # One layout pass per keystroke. While filtering only matches and their branches are left visible,
+        # so a single expandAll opens exactly the paths to the matches. The user's own folding is put back
+        # once the filter is cleared.
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            if is_filtering and self._pre_filter_state is None:
+                self._pre_filter_state = self.get_tree_state()
+            for item in self._tree_items.values():
+                item.setHidden(is_filtering)
+            if is_filtering:
+                # Qt does the (case-insensitive) matching in C++; matches are shown along with their ancestors.
+                for item in self.tree.findItems(text, Qt.MatchFlag.MatchContains | Qt.MatchFlag.MatchRecursive, 0):
+                    while item is not None and item.isHidden():
+                        item.setHidden(False)
+                        item = item.parent()
+                self.tree.expandAll()
+            elif self._pre_filter_state is not None:
+                for key, item in self._tree_items.items():
+                    if isinstance(key, tuple): item.setExpanded(key not in self._pre_filter_state)
+                self._pre_filter_state = None
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
 
     def fold_all_items(self):
         self.tree.collapseAll()
@@ -102,6 +102,55 @@ class TestKeyframeLogic:
         assert len(encoded) == 9
         assert encoded.startswith("A")
 
+    def test_encode_keyframes_matches_single_encoding(self):
+        """Sprawdza, czy kodowanie sekwencji daje te same ciągi co kolejne wywołania encode_keyframe."""
+        expected = [KeyframeEncoder.encode_keyframe(0.0, 1.0, 3, 0.0, -1), KeyframeEncoder.encode_keyframe(2.0, 1.0, 3, 1.0, 3)]
+        assert KeyframeEncoder.encode_keyframes([(0.0, 1.0, 3), (2.0, 1.0, 3)]) == expected
+
+# --- Testy dla Modeli Danych ---
+
+class TestDataModels:
+    def test_animation_length_round_trip(self):
+        """Sprawdza, czy długość klipu zapisuje się w oryginalnej postaci tekstowej, a po zmianie jest odświeżana."""
+        clip = AnimationClip.from_dict({"AnimationName": "A", "AnimationLength": "1"})
+        assert clip.length == 1.0
+        assert clip.to_dict()["AnimationLength"] == "1"
+        clip.length = 2.5
+        assert clip.to_dict()["AnimationLength"] == "2.5"
+
+    def test_target_key_sets_follow_changes(self):
+        """Sprawdza, czy zbiory kluczy celów klipu są aktualizowane po dodaniu lub podmianie celów."""
+        clip = AnimationClip("A", "S1", "L1", 1.0)
+        assert clip.float_param_keys() == set()
+        clip.add_float_param(FloatParameter("geometry", "morph", [], None, None))
+        clip.add_controller(ControllerTarget("hipControl"))
+        assert clip.float_param_keys() == {("geometry", "morph")}
+        assert clip.controller_ids() == {"hipControl"}
+        clip.controllers = []
+        assert clip.controller_ids() == set()
+
+    def test_targets_stay_in_save_order(self):
+        """Sprawdza, czy kontrolery są przechowywane i zapisywane w kolejności id niezależnie od kolejności dodawania."""
+        clip = AnimationClip.from_dict({"Controllers": [{"Controller": "lHandControl"}, {"Controller": "hipControl"}]})
+        clip.add_controller(ControllerTarget("chestControl"))
+        assert [c.id for c in clip.controllers] == ["chestControl", "hipControl", "lHandControl"]
+        assert [c["Controller"] for c in clip.to_dict()["Controllers"]] == ["chestControl", "hipControl", "lHandControl"]
+
+    def test_clone_is_independent(self):
+        """Sprawdza, czy klon klipu zapisuje się identycznie, a jego zmiany nie wpływają na oryginał."""
+        data = {"AnimationName": "A", "AnimationLength": "2", "Loop": "1",
+                "Controllers": [{"Controller": "hipControl", "X": ["AAAAAAAAAAAAAAAA03"]}],
+                "FloatParams": [{"Storable": "geometry", "Name": "morph", "Value": []}],
+                "Triggers": [{"Name": "Audio 1", "Live": "0", "Triggers": [{"startTime": "0"}]}]}
+        clip = AnimationClip.from_dict(data)
+        before = json.dumps(clip.to_dict())
+        copy_ = clip.clone()
+        assert json.dumps(copy_.to_dict()) == before
+        copy_.controllers[0].properties["X"].append("x")
+        copy_.trigger_groups[0].triggers[0]["startTime"] = "1"
+        copy_.other_properties["Loop"] = "0"
+        assert json.dumps(clip.to_dict()) == before
+
 # --- Testy dla Głównej Logiki Aplikacji ---
 
 class TestAppLogic:
@@ -117,6 +166,16 @@ class TestAppLogic:
         app_logic_instance.load_file(path)
         assert app_logic_instance.animation_file is not None
         assert app_logic_instance.animation_file.is_scene
+
+    def test_gzip_save_and_load(self, app_logic_instance, temp_json_file, sample_animation_file_data, tmp_path):
+        app_logic_instance.load_file(temp_json_file("test.json", sample_animation_file_data))
+        expected = app_logic_instance.animation_file.to_dict()
+        gz_path = str(tmp_path / "test.json.gz")
+        app_logic_instance.save_file(gz_path)
+        with open(gz_path, "rb") as f: assert f.read(2) == b"\x1f\x8b"
+
+        app_logic_instance.load_file(gz_path)
+        assert app_logic_instance.animation_file.to_dict() == expected
         
     def test_mark_as_dirty(self, app_logic_instance):
         app_logic_instance.current_file_path = "test.json"
@@ -148,6 +207,29 @@ class TestAppLogic:
         app_logic_instance.rename_item(("layer", "Person", "NewSeg", "OldLayer"), "NewLayer")
         assert clip.layer == "NewLayer"
 
+    def test_segment_name_conflicts(self, app_logic_instance):
+        c1 = AnimationClip("A", "S1", "L1", 1.0, atom_id="Person")
+        c2 = AnimationClip("B", "S2", "L1", 1.0, atom_id="Person")
+        app_logic_instance.animation_file = AnimationFile()
+        app_logic_instance.animation_file.clips = [c1, c2]
+        errors = []
+        app_logic_instance.error_occurred.connect(lambda title, msg: errors.append(title))
+
+        app_logic_instance.rename_item(("segment", "Person", "S1"), "S2")
+        app_logic_instance.create_new_segment("S1")
+        assert c1.segment == "S1" and len(app_logic_instance.animation_file.clips) == 2
+        assert errors == ["Name Conflict", "Name Conflict"]
+
+        app_logic_instance.rename_item(("segment", "Person", "S1"), "S3")
+        app_logic_instance.create_new_segment("S1")
+        assert [c.segment for c in app_logic_instance.animation_file.clips] == ["S3", "S2", "S1"]
+
+        c3 = AnimationClip("C", "S2", "L2", 1.0, atom_id="Person")
+        app_logic_instance.animation_file.clips.append(c3)
+        app_logic_instance.mark_as_dirty()
+        app_logic_instance.rename_item(("layer", "Person", "S2", "L2"), "L1")
+        assert c3.layer == "L2" and errors == ["Name Conflict"] * 3
+
     def test_merge_layers(self, app_logic_instance):
         clip_a1 = AnimationClip("A1", "S1", "LayerA", 2.0, atom_id="Atom1")
         clip_a1.float_params.append(FloatParameter("Storable1", "ParamX", [], 0, 1))
@@ -195,6 +277,55 @@ class TestAppLogic:
         assert c1.layer == "LayerB"
         assert c1.order_index == 1
 
+    def test_structural_edits_report_changed_clips(self, app_logic_instance, temp_json_file, sample_animation_file_data):
+        path = temp_json_file("test.json", sample_animation_file_data)
+        app_logic_instance.load_file(path)
+        refreshes, added, removed, renamed = [], [], [], []
+        app_logic_instance.clips_updated.connect(lambda: refreshes.append(True))
+        app_logic_instance.clips_added.connect(added.extend)
+        app_logic_instance.clips_removed.connect(removed.extend)
+        app_logic_instance.clips_renamed.connect(renamed.extend)
+
+        app_logic_instance.create_new_segment("Extra")
+        clip_a, clip_b = app_logic_instance.animation_file.clips[:2]
+        app_logic_instance.delete_items([clip_b])
+        app_logic_instance.rename_item(clip_a, "Clip A2")
+        app_logic_instance.duplicate_clip(clip_a)
+        branches = []
+        app_logic_instance.branch_renamed.connect(lambda data, name: branches.append((data, name)))
+        app_logic_instance.rename_item(("segment", "(Standalone)", "Extra"), "Extra2")
+
+        assert [c.name for c in added] == ["New Animation", "Clip A2 (copy)"]
+        assert removed == [clip_b] and renamed == [clip_a] and not refreshes
+        assert branches == [(("segment", "(Standalone)", "Extra"), "Extra2")]
+
+    def test_layer_lookups_follow_moves(self, app_logic_instance):
+        c1 = AnimationClip("C1", "S1", "LayerA", 1.0, atom_id="A1")
+        c3 = AnimationClip("C3", "S1", "LayerB", 1.0, atom_id="A1")
+        app_logic_instance.animation_file = AnimationFile()
+        app_logic_instance.animation_file.clips = [c1, c3]
+        assert app_logic_instance.get_layer_clips("A1", "S1", "LayerB") == [c3]
+
+        app_logic_instance.move_or_copy_clips_to_layer([id(c1)], ("layer", "A1", "S1", "LayerB"), is_copy=False)
+
+        assert app_logic_instance.get_layer_clips("A1", "S1", "LayerB") == [c1, c3]
+        assert app_logic_instance.get_layer_clips("A1", "S1", "LayerA") == []
+
+    def test_reorder_clips_skips_full_refresh(self, app_logic_instance):
+        c1 = AnimationClip("C1", "S1", "L1", 1.0, order_index=0, atom_id="A1")
+        c2 = AnimationClip("C2", "S1", "L1", 1.0, order_index=1, atom_id="A1")
+        app_logic_instance.animation_file = AnimationFile()
+        app_logic_instance.animation_file.clips = [c1, c2]
+        refreshes, reordered = [], []
+        app_logic_instance.clips_updated.connect(lambda: refreshes.append(True))
+        app_logic_instance.layer_reordered.connect(reordered.append)
+        layer_data = ("layer", "A1", "S1", "L1")
+
+        app_logic_instance.reorder_clips_in_layer(layer_data, {id(c2)}, id(c1), "Above")
+
+        assert (c2.order_index, c1.order_index) == (0, 1)
+        assert reordered == [layer_data] and not refreshes
+
     def test_move_clip_to_compatible_layer(self, app_logic_instance):
         clip_s1a = AnimationClip("S1A", "Seg1", "LayerA", 1.0, atom_id="A1")
         clip_s1a.controllers.append(ControllerTarget("hipControl"))
@@ -314,6 +445,19 @@ class TestFileMerging:
 
         names = {c.name for c in app_logic_instance.animation_file.clips}
         assert {"BaseWalk", "BaseWalk_merged"} == names
+
+    def test_merge_with_name_conflict_replace(self, app_logic_instance, temp_json_file, base_file_data):
+        merge_data_conflict = {"SerializeVersion": "4", "AtomType": "Person", "Clips": [
+            {"AnimationName": "BaseWalk", "AnimationSegment": "Locomotion", "AnimationLayer": "Base", "AnimationLength": "3.0"}
+        ]}
+        base_path = temp_json_file("base.json", base_file_data)
+        merge_path = temp_json_file("merge_conflict.json", merge_data_conflict)
+        app_logic_instance.load_file(base_path)
+
+        app_logic_instance.merge_animation_file(merge_path, conflict_strategy="replace")
+
+        clips = app_logic_instance.animation_file.clips
+        assert [(c.name, c.length) for c in clips] == [("BaseWalk", 3.0)]
     
     def test_merge_fails_on_mismatched_atom_type(self, app_logic_instance, temp_json_file, base_file_data):
         merge_data_mismatch = {"SerializeVersion": "4", "AtomType": "Cube", "Clips": []}
@@ -12,6 +12,10 @@ from PyQt6.QtWidgets import (
 from data_models import AnimationClip, FloatParameter, ControllerTarget, TriggerGroup
 from keyframe_logic import KeyframeEncoder
 
+# Item data roles: 1000 holds the item's payload (a key tuple or an AnimationClip),
+# ROLE_KIND its level as a plain string ("atom", "segment", "layer" or "clip").
+ROLE_KIND = 1001
+
 class AnimationTreeWidget(QTreeWidget):
     def __init__(self, parent_window):
         super().__init__()
@@ -21,6 +25,7 @@ class AnimationTreeWidget(QTreeWidget):
         self.setDropIndicatorShown(True)
         self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
         self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setUniformRowHeights(True) # All rows are single-line text; lets the view skip per-row size queries
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.open_context_menu)
         self.itemDoubleClicked.connect(self.on_item_double_clicked)
@@ -56,13 +61,13 @@ class AnimationTreeWidget(QTreeWidget):
         drag = QDrag(self)
         mime_data = QMimeData()
         
-        data = item.data(0, 1000)
-        if isinstance(data, tuple) and data[0] == 'layer':
+        kind = item.data(0, ROLE_KIND)
+        if kind == 'layer':
             if len(items) > 1: return
             mime_data.setText("layer-drag")
             drag.setMimeData(mime_data)
             drag.exec(Qt.DropAction.MoveAction)
-        elif isinstance(data, AnimationClip):
+        elif kind == 'clip':
             mime_data.setText("clip-drag")
             drag.setMimeData(mime_data)
             drag.exec(Qt.DropAction.MoveAction | Qt.DropAction.CopyAction, Qt.DropAction.MoveAction)
@@ -80,26 +85,27 @@ class AnimationTreeWidget(QTreeWidget):
         source_item = self.selectedItems()[0]
         target_item_at_point = self.itemAt(event.position().toPoint())
         
-        src_data = source_item.data(0, 1000)
-        tgt_data = target_item_at_point.data(0, 1000) if target_item_at_point else None
-        
-        if not (src_data and isinstance(src_data, tuple) and src_data[0] == 'layer'):
+        if source_item.data(0, ROLE_KIND) != 'layer':
             event.ignore()
             return
+        src_data = source_item.data(0, 1000)
 
         target_layer_item = None
-        if tgt_data:
-            if isinstance(tgt_data, tuple) and tgt_data[0] == 'layer':
-                target_layer_item = target_item_at_point
-            elif isinstance(tgt_data, AnimationClip):
-                target_layer_item = target_item_at_point.parent()
+        tgt_layer_data = None
+        tgt_kind = target_item_at_point.data(0, ROLE_KIND) if target_item_at_point else None
+        if tgt_kind == 'layer':
+            target_layer_item = target_item_at_point
+            tgt_layer_data = target_item_at_point.data(0, 1000)
+        elif tgt_kind == 'clip':
+            target_layer_item = target_item_at_point.parent()
+            tgt_layer_data = target_layer_item.data(0, 1000)
         
         if not target_layer_item or source_item == target_layer_item:
             event.ignore()
             return
             
         src_layer_name = src_data[3]
-        tgt_layer_name = target_layer_item.data(0, 1000)[3]
+        tgt_layer_name = tgt_layer_data[3]
         
         reply = QMessageBox.question(self, 'Confirm Layer Merge', 
                                      f"Are you sure you want to merge layer '{src_layer_name}' into '{tgt_layer_name}'?",
@@ -107,7 +113,7 @@ class AnimationTreeWidget(QTreeWidget):
                                      QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.parent_window.app_logic.merge_layers(src_data, target_layer_item.data(0, 1000))
+            self.parent_window.app_logic.merge_layers(src_data, tgt_layer_data)
             event.acceptProposedAction()
         else:
             event.ignore()
@@ -123,14 +129,17 @@ class AnimationTreeWidget(QTreeWidget):
         source_layer_item = source_items[0].parent()
         
         target_layer_item = None
-        target_clip_for_pos = None
+        target_layer_data = None
+        target_clip = None
         
-        target_data = target_item.data(0, 1000)
-        if isinstance(target_data, AnimationClip):
+        target_kind = target_item.data(0, ROLE_KIND)
+        if target_kind == 'clip':
             target_layer_item = target_item.parent()
-            target_clip_for_pos = target_item
-        elif isinstance(target_data, tuple) and target_data[0] == 'layer':
+            target_layer_data = target_layer_item.data(0, 1000)
+            target_clip = target_item.data(0, 1000)
+        elif target_kind == 'layer':
             target_layer_item = target_item
+            target_layer_data = target_item.data(0, 1000)
         
         if not target_layer_item:
             event.ignore()
@@ -142,10 +151,10 @@ class AnimationTreeWidget(QTreeWidget):
         if not is_copy and source_layer_item == target_layer_item:
             drop_pos_enum = self.dropIndicatorPosition()
             drop_pos = 'Below' if drop_pos_enum == QAbstractItemView.DropIndicatorPosition.BelowItem else 'Above'
-            target_clip_id = id(target_clip_for_pos.data(0, 1000)) if target_clip_for_pos else None
-            app_logic.reorder_clips_in_layer(target_layer_item.data(0, 1000), dragged_clips_ids, target_clip_id, drop_pos)
+            target_clip_id = id(target_clip) if target_clip else None
+            app_logic.reorder_clips_in_layer(target_layer_data, dragged_clips_ids, target_clip_id, drop_pos)
         else:
-            app_logic.move_or_copy_clips_to_layer(dragged_clips_ids, target_layer_item.data(0, 1000), is_copy)
+            app_logic.move_or_copy_clips_to_layer(dragged_clips_ids, target_layer_data, is_copy)
         
         event.acceptProposedAction()
         
@@ -158,7 +167,7 @@ class AnimationTreeWidget(QTreeWidget):
                 rename_action = menu.addAction("Rename...")
                 rename_action.setShortcut("F2")
                 rename_action.triggered.connect(self.parent_window.rename_selected_item)
-                if isinstance(item.data(0, 1000), AnimationClip):
+                if item.data(0, ROLE_KIND) == 'clip':
                     duplicate_action = menu.addAction("Duplicate Clip")
                     duplicate_action.setShortcut("Ctrl+D")
                     duplicate_action.triggered.connect(self.parent_window.duplicate_selected_clip)